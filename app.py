@@ -3,13 +3,27 @@ Inventory Management System
 A Flask-based inventory management application for shops, pharmacies, and warehouses.
 """
 
-from flask import Flask, render_template, request, redirect, url_for, session, flash
+from flask import Flask, Response, make_response, render_template, request, redirect, url_for, session, flash
+from flask_session import Session
 from werkzeug.security import generate_password_hash, check_password_hash
+import orjson
+import redis
 import sqlite3
+import json
+import logging
+import csv
+import hashlib
+import io
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from functools import wraps
 import os
 from datetime import timedelta
 
+logger = logging.getLogger(__name__)
+
 # Initialize Flask app
 
 # Use environment variable for Flask secret key (required in production)
@@ -17,63 +31,301 @@ app = Flask(__name__)
 app.secret_key = os.getenv('FLASK_SECRET_KEY')
 if not app.secret_key:
     raise RuntimeError('FLASK_SECRET_KEY environment variable is required for production.')
-app.permanent_session_lifetime = timedelta(hours=2)  # Session timeout
+
+# Server-side sessions: Redis in production, SESSION_TYPE=filesystem for local dev
+REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+redis_client = redis.Redis.from_url(REDIS_URL, socket_keepalive=True, socket_connect_timeout=2)
+app.config['SESSION_TYPE'] = os.environ.get('SESSION_TYPE', 'redis')
+app.config['SESSION_REDIS'] = redis_client
+app.config['SESSION_PERMANENT'] = True
+app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(hours=2)  # Session timeout
+Session(app)
+
+# Reject request bodies (CSV uploads included) larger than this many bytes
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('MAX_CONTENT_LENGTH', 2 * 1024 * 1024))
 
 # Database configuration
 DATABASE = os.environ.get('DATABASE', 'database.db')
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 8))
+
+# Bump SCHEMA_VERSION whenever SCHEMA changes so init_db() applies it again
+SCHEMA_VERSION = 1
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT UNIQUE NOT NULL,
+        password TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS products (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        product_name TEXT NOT NULL,
+        category TEXT NOT NULL,
+        price REAL NOT NULL,
+        quantity INTEGER NOT NULL DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    -- Indexes for the dashboard's low stock count and newest-first listing
+    CREATE INDEX IF NOT EXISTS idx_products_quantity ON products(quantity);
+    CREATE INDEX IF NOT EXISTS idx_products_created_at ON products(created_at DESC);
+"""
+
+# Per-connection tuning. WAL mode keeps "<DATABASE>-wal" and "<DATABASE>-shm"
+# files next to the database; they must stay with it when it is moved.
+SQLITE_PRAGMAS = """
+    PRAGMA journal_mode = WAL;
+    PRAGMA synchronous = NORMAL;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA cache_size = -64000;
+    PRAGMA mmap_size = 268435456;
+    PRAGMA busy_timeout = 30000;
+"""
+
+# Pool of reusable SQLite connections shared by all request threads
+DB_POOL = queue.Queue(maxsize=DB_POOL_SIZE)
+_pool_lock = threading.Lock()
+_pool_opened = 0
 
 # Low stock threshold
 LOW_STOCK_THRESHOLD = 10
 
+# Threads that verify password hashes; caps how many logins hash at once
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 4))
+EXECUTOR = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS)
+
+# Seconds a cached user row stays in Redis
+USER_CACHE_TTL = 300
+
+# Product form fields as (name, label, type), in products table column order
+_PRODUCT_FIELDS = (
+    ('product_name', 'Product name', str),
+    ('category', 'Category', str),
+    ('price', 'Price', float),
+    ('quantity', 'Quantity', int),
+)
+
+# Cached dashboard products and stats, busted on every product change
+DASHBOARD_CACHE_KEY = 'dash:v1'
+DASHBOARD_CACHE_TTL = 60
+
 
 
 def init_db():
     """
     Initialize the SQLite database and create tables if they don't exist.
     Also ensures a default admin user exists (username: admin, password: admin123).
+    Does nothing once PRAGMA user_version shows the current SCHEMA_VERSION.
     """
-    conn = sqlite3.connect(DATABASE)
-    cursor = conn.cursor()
-    # Create users table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE NOT NULL,
-            password TEXT NOT NULL
-        )
-    ''')
-    # Create products table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS products (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            product_name TEXT NOT NULL,
-            category TEXT NOT NULL,
-            price REAL NOT NULL,
-            quantity INTEGER NOT NULL DEFAULT 0,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    # Insert default admin user if not exists (INSERT OR IGNORE)
-    hashed_password = generate_password_hash('admin123')
-    cursor.execute("INSERT OR IGNORE INTO users (username, password) VALUES (?, ?)", ('admin', hashed_password))
-    conn.commit()
-    conn.close()
-    print("Database initialized and admin user ensured.")
+    conn = sqlite3.connect(DATABASE, timeout=30)
+    try:
+        cursor = conn.cursor()
+        if cursor.execute('PRAGMA user_version').fetchone()[0] >= SCHEMA_VERSION:
+            return
+        
+        # Take the write lock before the DDL so concurrent processes wait for each other
+        cursor.executescript('BEGIN IMMEDIATE;' + SCHEMA)
+        # Another process may have finished while we waited for the lock
+        if cursor.execute('PRAGMA user_version').fetchone()[0] >= SCHEMA_VERSION:
+            conn.rollback()
+            return
+        # Insert default admin user if not exists (hash only when it looks missing;
+        # INSERT OR IGNORE keeps a concurrent initializer that won the race harmless)
+        cursor.execute("SELECT 1 FROM users WHERE username = 'admin'")
+        if cursor.fetchone() is None:
+            hashed_password = generate_password_hash('admin123')
+            cursor.execute("INSERT OR IGNORE INTO users (username, password) VALUES (?, ?)", ('admin', hashed_password))
+        # Record the version last so an interrupted run is retried
+        cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        conn.commit()
+        # Refresh planner statistics so the indexes are used
+        cursor.execute('ANALYZE')
+    finally:
+        conn.close()
+    logger.info("Database initialized and admin user ensured.")
+
 
+_db_initialized = False
+_db_init_lock = threading.Lock()
 
-# Initialize database when app starts
-init_db()
 
+@app.before_request
+def ensure_db():
+    """Run init_db() once per process, before the first request is handled."""
+    global _db_initialized
+    if _db_initialized:
+        return
+    with _db_init_lock:
+        if not _db_initialized:
+            init_db()
+            _db_initialized = True
 
-def get_db_connection():
-    """Create and return a database connection."""
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Create the database tables and default admin user."""
+    init_db()
+
+
+def _open_connection():
+    """Open a new SQLite connection suitable for sharing across threads."""
+    conn = sqlite3.connect(DATABASE, check_same_thread=False)
+    conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+    conn.executescript(SQLITE_PRAGMAS)
+    return conn
+
+
+@contextmanager
+def db_conn():
+    """
+    Borrow a connection from the pool and return it when done.
+    Connections are opened lazily, so each worker process builds its own pool.
+    """
+    global _pool_opened
     try:
-        conn = sqlite3.connect(DATABASE)
-        conn.row_factory = sqlite3.Row  # Return rows as dictionaries
-        return conn
-    except Exception as e:
-        print(f"Error connecting to SQLite: {e}")
+        conn = DB_POOL.get_nowait()
+    except queue.Empty:
+        with _pool_lock:
+            grow = _pool_opened < DB_POOL_SIZE
+            if grow:
+                _pool_opened += 1
+        if grow:
+            try:
+                conn = _open_connection()
+            except Exception:
+                with _pool_lock:
+                    _pool_opened -= 1
+                raise
+        else:
+            conn = DB_POOL.get()
+    try:
+        yield conn
+    finally:
+        # Never hand an open transaction to the next borrower
+        if conn.in_transaction:
+            conn.rollback()
+        DB_POOL.put(conn)
+
+
+def _user_cache_key(username):
+    return f"user:{username}"
+
+
+def get_user_by_username(username):
+    """
+    Look up a user row as a dict, reading through the Redis cache.
+    Falls back to SQLite alone if Redis is unavailable.
+    """
+    key = _user_cache_key(username)
+    try:
+        cached = redis_client.get(key)
+        if cached is not None:
+            return json.loads(cached)
+    except redis.RedisError:
+        pass
+    
+    with db_conn() as conn:
+        row = conn.execute("SELECT id, username, password FROM users WHERE username = ?", (username,)).fetchone()
+    if row is None:
         return None
+    
+    user = dict(row)
+    try:
+        redis_client.setex(key, USER_CACHE_TTL, json.dumps(user))
+    except redis.RedisError:
+        pass
+    return user
+
+
+def invalidate_user_cache(username):
+    """Drop a cached user row; call after any change to that user."""
+    try:
+        redis_client.delete(_user_cache_key(username))
+    except redis.RedisError:
+        pass
+
+
+def load_dashboard_data():
+    """
+    Return the (products, stats) shown on the dashboard, reading through the Redis cache.
+    Falls back to SQLite alone if Redis is unavailable.
+    """
+    try:
+        cached = redis_client.get(DASHBOARD_CACHE_KEY)
+        if cached is not None:
+            data = orjson.loads(cached)
+            return data['products'], data['stats']
+    except redis.RedisError:
+        pass
+    
+    with db_conn() as conn:
+        cursor = conn.cursor()
+        
+        # Get all products, flagging low stock in SQL
+        cursor.execute(
+            "SELECT id, product_name, category, price, quantity, (quantity < ?) AS is_low_stock "
+            "FROM products ORDER BY created_at DESC",
+            (LOW_STOCK_THRESHOLD,)
+        )
+        products = [dict(row) for row in cursor.fetchall()]
+        
+        # Calculate statistics in a single pass
+        cursor.execute(
+            "SELECT COUNT(*) AS total_products, COALESCE(SUM(quantity), 0) AS total_stock, "
+            "COALESCE(SUM(quantity < ?), 0) AS low_stock_count FROM products",
+            (LOW_STOCK_THRESHOLD,)
+        )
+        stats = dict(cursor.fetchone())
+    
+    try:
+        redis_client.setex(DASHBOARD_CACHE_KEY, DASHBOARD_CACHE_TTL,
+                           orjson.dumps({'products': products, 'stats': stats}))
+    except redis.RedisError:
+        pass
+    return products, stats
+
+
+def invalidate_dashboard_cache():
+    """Drop the cached dashboard data; call after any product change."""
+    try:
+        redis_client.delete(DASHBOARD_CACHE_KEY)
+    except redis.RedisError:
+        pass
+
+
+def parse_product_form(form):
+    """
+    Validate and coerce product fields from a form or CSV row mapping.
+    Returns (values, errors); values follows _PRODUCT_FIELDS order.
+    """
+    values = {}
+    errors = []
+    for field, label, kind in _PRODUCT_FIELDS:
+        raw = form.get(field) or ''
+        if kind is str:
+            value = raw.strip()
+            if not value:
+                errors.append(f'{label} is required.')
+        else:
+            try:
+                value = kind(raw)
+            except ValueError:
+                errors.append(f'Please enter a valid {label.lower()}.')
+                continue
+            if value < 0:
+                errors.append(f'{label} cannot be negative.')
+        values[field] = value
+    return values, errors
+
+
+def insert_products(conn, rows):
+    """
+    Insert (product_name, category, price, quantity) tuples in a single transaction.
+    Commits once at the end, or rolls back every row if any insert fails.
+    """
+    with conn:
+        conn.executemany(
+            "INSERT INTO products (product_name, category, price, quantity) VALUES (?, ?, ?, ?)",
+            rows
+        )
 
 
 def login_required(f):
@@ -109,17 +361,12 @@ def login():
             flash('Please enter both username and password.', 'danger')
             return render_template('login.html')
         
-        conn = get_db_connection()
-        if not conn:
-            flash('Database connection error. Please try again later.', 'danger')
-            return render_template('login.html')
-        
         try:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM users WHERE username = ?", (username,))
-            user = cursor.fetchone()
+            user = get_user_by_username(username)
             
-            if user and check_password_hash(user['password'], password):
+            if user and EXECUTOR.submit(check_password_hash, user['password'], password).result():
+                # Issue a new session id so a pre-login (possibly planted) one is never authenticated
+                app.session_interface.regenerate(session)
                 session.permanent = True
                 session['user_id'] = user['id']
                 session['username'] = user['username']
@@ -129,8 +376,6 @@ def login():
                 flash('Invalid username or password.', 'danger')
         except Exception as e:
             flash(f'An error occurred: {e}', 'danger')
-        finally:
-            conn.close()
     
     return render_template('login.html')
 
@@ -140,6 +385,8 @@ def logout():
     """Handle user logout."""
     session.clear()
     flash('You have been logged out successfully.', 'info')
+    # Drop the stored session and carry the flash message under a new id
+    app.session_interface.regenerate(session)
     return redirect(url_for('login'))
 
 
@@ -147,38 +394,42 @@ def logout():
 @login_required
 def dashboard():
     """Display the main dashboard with all products."""
-    conn = get_db_connection()
-    if not conn:
-        flash('Database connection error.', 'danger')
-        return render_template('dashboard.html', products=[], stats={})
-    
     try:
-        cursor = conn.cursor()
-        
-        # Get all products
-        cursor.execute("SELECT * FROM products ORDER BY created_at DESC")
-        products = [dict(row) for row in cursor.fetchall()]
-        
-        # Calculate statistics
-        cursor.execute("SELECT COUNT(*) as total_products, COALESCE(SUM(quantity), 0) as total_stock FROM products")
-        stats = dict(cursor.fetchone())
-        
-        # Count low stock items
-        cursor.execute("SELECT COUNT(*) as low_stock_count FROM products WHERE quantity < ?", (LOW_STOCK_THRESHOLD,))
-        low_stock = cursor.fetchone()
-        stats['low_stock_count'] = low_stock['low_stock_count']
-        
-        # Mark low stock products
-        for product in products:
-            product['is_low_stock'] = product['quantity'] < LOW_STOCK_THRESHOLD
-        
-        return render_template('dashboard.html', products=products, stats=stats, threshold=LOW_STOCK_THRESHOLD)
-    
+        products, stats = load_dashboard_data()
     except Exception as e:
         flash(f'An error occurred: {e}', 'danger')
         return render_template('dashboard.html', products=[], stats={})
-    finally:
-        conn.close()
+    
+    # The ETag covers everything the page shows, so any product change produces a new one.
+    # Pending flash messages are also rendered, so never answer 304 while some are queued.
+    etag = hashlib.blake2b(
+        orjson.dumps([session.get('username'), products, stats]), digest_size=8
+    ).hexdigest()
+    if '_flashes' not in session and request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = make_response(
+            render_template('dashboard.html', products=products, stats=stats, threshold=LOW_STOCK_THRESHOLD)
+        )
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+@app.route('/api/products')
+@login_required
+def api_products():
+    """
+    Return all products as JSON rows, newest first.
+    Each row is [id, product_name, category, price, quantity, low_stock (0/1)].
+    """
+    with db_conn() as conn:
+        rows = conn.execute(
+            "SELECT id, product_name, category, price, quantity, (quantity < ?) AS low "
+            "FROM products ORDER BY created_at DESC",
+            (LOW_STOCK_THRESHOLD,)
+        ).fetchall()
+    return Response(orjson.dumps([tuple(row) for row in rows]), mimetype='application/json')
 
 
 @app.route('/add_product', methods=['GET', 'POST'])
@@ -186,116 +437,101 @@ def dashboard():
 def add_product():
     """Add a new product to inventory."""
     if request.method == 'POST':
-        product_name = request.form.get('product_name', '').strip()
-        category = request.form.get('category', '').strip()
-        price = request.form.get('price', '')
-        quantity = request.form.get('quantity', '')
+        product, errors = parse_product_form(request.form)
         
-        # Validation
-        errors = []
-        if not product_name:
-            errors.append('Product name is required.')
-        if not category:
-            errors.append('Category is required.')
+        if errors:
+            for error in errors:
+                flash(error, 'danger')
+            return render_template('add_product.html')
         
         try:
-            price = float(price)
-            if price < 0:
-                errors.append('Price cannot be negative.')
-        except (ValueError, TypeError):
-            errors.append('Please enter a valid price.')
+            with db_conn() as conn:
+                insert_products(conn, [tuple(product.values())])
+            invalidate_dashboard_cache()
+            flash(f'Product "{product["product_name"]}" added successfully!', 'success')
+            return redirect(url_for('dashboard'))
+        except Exception as e:
+            flash(f'An error occurred: {e}', 'danger')
+    
+    return render_template('add_product.html')
+
+
+@app.route('/bulk_import', methods=['GET', 'POST'])
+@login_required
+def bulk_import():
+    """Add many products at once from an uploaded CSV file."""
+    if request.method == 'POST':
+        upload = request.files.get('csv_file')
+        if not upload or not upload.filename:
+            flash('Please choose a CSV file to import.', 'danger')
+            return render_template('bulk_import.html')
         
         try:
-            quantity = int(quantity)
-            if quantity < 0:
-                errors.append('Quantity cannot be negative.')
-        except (ValueError, TypeError):
-            errors.append('Please enter a valid quantity.')
+            reader = csv.DictReader(io.StringIO(upload.read().decode('utf-8-sig')))
+        except UnicodeDecodeError:
+            flash('The CSV file must be UTF-8 encoded.', 'danger')
+            return render_template('bulk_import.html')
+        
+        # Check the header once so a wrong file gets one error, not several per row
+        missing = [field for field, _, _ in _PRODUCT_FIELDS if field not in (reader.fieldnames or [])]
+        if missing:
+            flash(f'The CSV file is missing columns: {", ".join(missing)}.', 'danger')
+            return render_template('bulk_import.html')
+        
+        # Validation (line 1 is the header)
+        rows = []
+        errors = []
+        for line, record in enumerate(reader, start=2):
+            product, row_errors = parse_product_form(record)
+            errors.extend(f'Line {line}: {error}' for error in row_errors)
+            rows.append(tuple(product.values()))
+        
+        if not errors and not rows:
+            errors.append('The CSV file contains no products.')
         
         if errors:
             for error in errors:
                 flash(error, 'danger')
-            return render_template('add_product.html')
-        
-        conn = get_db_connection()
-        if not conn:
-            flash('Database connection error.', 'danger')
-            return render_template('add_product.html')
+            return render_template('bulk_import.html')
         
         try:
-            cursor = conn.cursor()
-            cursor.execute(
-                "INSERT INTO products (product_name, category, price, quantity) VALUES (?, ?, ?, ?)",
-                (product_name, category, price, quantity)
-            )
-            conn.commit()
-            flash(f'Product "{product_name}" added successfully!', 'success')
+            with db_conn() as conn:
+                insert_products(conn, rows)
+            invalidate_dashboard_cache()
+            flash(f'{len(rows)} product(s) imported successfully!', 'success')
             return redirect(url_for('dashboard'))
         except Exception as e:
             flash(f'An error occurred: {e}', 'danger')
-        finally:
-            conn.close()
     
-    return render_template('add_product.html')
+    return render_template('bulk_import.html')
 
 
 @app.route('/edit_product/<int:id>', methods=['GET', 'POST'])
 @login_required
 def edit_product(id):
     """Edit an existing product."""
-    conn = get_db_connection()
-    if not conn:
-        flash('Database connection error.', 'danger')
-        return redirect(url_for('dashboard'))
-    
     try:
-        cursor = conn.cursor()
-        
         if request.method == 'POST':
-            product_name = request.form.get('product_name', '').strip()
-            category = request.form.get('category', '').strip()
-            price = request.form.get('price', '')
-            quantity = request.form.get('quantity', '')
-            
-            # Validation
-            errors = []
-            if not product_name:
-                errors.append('Product name is required.')
-            if not category:
-                errors.append('Category is required.')
-            
-            try:
-                price = float(price)
-                if price < 0:
-                    errors.append('Price cannot be negative.')
-            except (ValueError, TypeError):
-                errors.append('Please enter a valid price.')
-            
-            try:
-                quantity = int(quantity)
-                if quantity < 0:
-                    errors.append('Quantity cannot be negative.')
-            except (ValueError, TypeError):
-                errors.append('Please enter a valid quantity.')
+            product, errors = parse_product_form(request.form)
             
-            if errors:
-                for error in errors:
-                    flash(error, 'danger')
-                cursor.execute("SELECT * FROM products WHERE id = ?", (id,))
-                product = dict(cursor.fetchone())
-                return render_template('edit_product.html', product=product)
+            if not errors:
+                with db_conn() as conn, conn:
+                    conn.execute(
+                        "UPDATE products SET product_name = ?, category = ?, price = ?, quantity = ? WHERE id = ?",
+                        (*product.values(), id)
+                    )
+                invalidate_dashboard_cache()
+                flash(f'Product "{product["product_name"]}" updated successfully!', 'success')
+                return redirect(url_for('dashboard'))
             
-            cursor.execute(
-                "UPDATE products SET product_name = ?, category = ?, price = ?, quantity = ? WHERE id = ?",
-                (product_name, category, price, quantity, id)
-            )
-            conn.commit()
-            flash(f'Product "{product_name}" updated successfully!', 'success')
-            return redirect(url_for('dashboard'))
+            for error in errors:
+                flash(error, 'danger')
         
-        # GET request - fetch product details
-        cursor.execute("SELECT * FROM products WHERE id = ?", (id,))
-        row = cursor.fetchone()
+        # Fetch product details (GET, or redisplay after failed validation)
+        with db_conn() as conn:
+            row = conn.execute(
+                "SELECT id, product_name, category, price, quantity, created_at FROM products WHERE id = ?", (id,)
+            ).fetchone()
         
         if not row:
             flash('Product not found.', 'danger')
@@ -307,89 +543,55 @@ def edit_product(id):
     except Exception as e:
         flash(f'An error occurred: {e}', 'danger')
         return redirect(url_for('dashboard'))
-    finally:
-        conn.close()
 
 
-@app.route('/delete_product/<int:id>')
+@app.route('/delete_product/<int:id>', methods=['POST'])
 @login_required
 def delete_product(id):
     """Delete a product from inventory."""
-    conn = get_db_connection()
-    if not conn:
-        flash('Database connection error.', 'danger')
-        return redirect(url_for('dashboard'))
-    
     try:
-        cursor = conn.cursor()
-        
-        # Get product name for confirmation message
-        cursor.execute("SELECT product_name FROM products WHERE id = ?", (id,))
-        product = cursor.fetchone()
+        # Delete and fetch the name for the confirmation message in one statement
+        with db_conn() as conn, conn:
+            product = conn.execute(
+                "DELETE FROM products WHERE id = ? RETURNING product_name", (id,)
+            ).fetchone()
         
         if not product:
             flash('Product not found.', 'danger')
             return redirect(url_for('dashboard'))
         
-        cursor.execute("DELETE FROM products WHERE id = ?", (id,))
-        conn.commit()
+        invalidate_dashboard_cache()
         flash(f'Product "{product["product_name"]}" deleted successfully!', 'success')
     
     except Exception as e:
         flash(f'An error occurred: {e}', 'danger')
-    finally:
-        conn.close()
     
     return redirect(url_for('dashboard'))
 
 
-@app.route('/create_admin')
-def create_admin():
-    """Utility route to create the default admin user."""
-    conn = get_db_connection()
-    if not conn:
-        return "Database connection error."
-    
-    try:
-        cursor = conn.cursor()
-        
-        # Check if admin exists
-        cursor.execute("SELECT * FROM users WHERE username = 'admin'")
-        if cursor.fetchone():
-            return "Admin user already exists. Login with username: admin, password: admin123"
-        
-        # Create admin user with hashed password
-        hashed_password = generate_password_hash('admin123')
-        cursor.execute(
-            "INSERT INTO users (username, password) VALUES (?, ?)",
-            ('admin', hashed_password)
-        )
-        conn.commit()
-        return "Admin user created successfully! Username: admin, Password: admin123"
-    
-    except Exception as e:
-        return f"Error: {e}"
-    finally:
-        conn.close()
-
-
 # Error handlers
 @app.errorhandler(404)
 def page_not_found(e):
     """Handle 404 errors."""
-    flash('Page not found.', 'warning')
-    return redirect(url_for('dashboard'))
+    return render_template('error.html', code=404, message='Page not found.'), 404
+
+
+@app.errorhandler(413)
+def request_too_large(e):
+    """Handle uploads larger than MAX_CONTENT_LENGTH."""
+    return render_template('error.html', code=413, message='The uploaded file is too large.'), 413
 
 
 @app.errorhandler(500)
 def internal_error(e):
     """Handle 500 errors."""
-    flash('An internal error occurred. Please try again.', 'danger')
-    return redirect(url_for('dashboard'))
+    return render_template('error.html', code=500, message='An internal error occurred. Please try again.'), 500
 
 
 if __name__ == '__main__':
+    logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO'))
     # Run the application
     debug_mode = os.environ.get('FLASK_DEBUG', 'True').lower() == 'true'
     port = int(os.environ.get('PORT', 5000))
+    init_db()
     app.run(debug=debug_mode, host='0.0.0.0', port=port)
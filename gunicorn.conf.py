@@ -0,0 +1,27 @@
+"""
+Gunicorn configuration for production.
+Start with: gunicorn -c gunicorn.conf.py app:app
+"""
+
+import logging
+import os
+
+# The app logs through the standard logging module; gunicorn only configures its own loggers
+logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO'))
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# Threaded workers: password hashing and SQLite release the GIL, so threads overlap
+workers = int(os.environ.get('WEB_CONCURRENCY', max(2, os.cpu_count() or 1)))
+worker_class = 'gthread'
+threads = 8
+keepalive = 5
+
+# Load the app once in the master and fork workers from it
+preload_app = True
+
+
+def when_ready(server):
+    """Create the database in the master before any worker is forked."""
+    from app import init_db
+    init_db()